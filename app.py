@@ -1,19 +1,116 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from PIL import Image, ImageOps
 import os
+import io
+import shutil
+import tempfile
+import time
+import uuid
+import hashlib
+from collections import deque
 from datetime import date, datetime, timedelta
-import traceback
 import logging
 
-# ログ設定
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# ログ設定（再実行のたびに設定し直さないよう、ハンドラ未設定の場合のみ）
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # 定数の設定
-SAVE_FILE = "pet_journal_data.csv"
-GROWTH_LOG_FILE = "growth_log.csv"
-MEMO_LOG_FILE = "memo_log.csv"
+DATA_DIR = "data"
+SAVE_DIR = os.path.join(DATA_DIR, "pet_journal")
+GROWTH_LOG_DIR = os.path.join(DATA_DIR, "growth_log")
+MEMO_LOG_DIR = os.path.join(DATA_DIR, "memo_log")
 IMAGE_DIR = "images"
 
+# 画像保存時の最大サイズとJPEG品質
+IMAGE_MAX_SIZE = (1600, 1600)
+IMAGE_JPEG_QUALITY = 85
+
+# 表示用にキャッシュする画像の数（1匹分の写真2枚・手形・誕生日の4枚に余裕を持たせる）
+IMAGE_CACHE_ENTRIES = 8
+
+# 旧形式のCSVファイルと移行先（移行先が未作成のものだけ変換する）
+LEGACY_FILES = [
+    (SAVE_DIR, "pet_journal_data.csv"),
+    (GROWTH_LOG_DIR, "growth_log.csv"),
+    (MEMO_LOG_DIR, "memo_log.csv"),
+]
+
+# データセットごとのスキーマ（Parquetで保存し、パーティションごとにファイルを分ける）
+DATASET_SCHEMAS = {
+    SAVE_DIR: pa.schema([
+        ("名前", pa.string()),
+        ("ペットキー", pa.string()),
+        ("ページ", pa.string()),
+        ("生まれた日", pa.date32()),
+        ("生まれた時間", pa.time64("us")),
+        ("場所", pa.string()),
+        ("天気", pa.string()),
+        ("体重", pa.string()),
+        ("身長", pa.string()),
+        ("メッセージ", pa.string()),
+        ("日付", pa.date32()),
+        ("コメント", pa.string()),
+        ("曜日", pa.string()),
+        ("できたこと", pa.string()),
+        ("メモ", pa.string()),
+    ]),
+    GROWTH_LOG_DIR: pa.schema([
+        ("名前", pa.string()),
+        ("ペットキー", pa.string()),
+        ("日付時間", pa.timestamp("ns")),
+        ("生後日数", pa.int64()),
+        ("食事内容", pa.string()),
+        ("グラム", pa.int64()),
+        ("おしっこ・うんち", pa.string()),
+        ("散歩", pa.string()),
+        ("睡眠", pa.string()),
+        ("MEMO", pa.string()),
+    ]),
+    MEMO_LOG_DIR: pa.schema([
+        ("名前", pa.string()),
+        ("ペットキー", pa.string()),
+        ("ページ", pa.string()),
+        ("日付", pa.date32()),
+        ("メモ", pa.string()),
+    ]),
+}
+
+# パーティション列（ページ・ペット単位で読み書きできるようにする）
+# 名前をそのままディレクトリ名にすると長い名前でファイル名の上限を超えるため、名前から作った固定長のキーを使う
+PARTITION_COLUMNS = {
+    SAVE_DIR: ["ページ", "ペットキー"],
+    GROWTH_LOG_DIR: ["ペットキー"],
+    MEMO_LOG_DIR: ["ペットキー"],
+}
+
+# 追記でパーティション内のファイルがこの数を超えたら1つのファイルにまとめ直す
+COMPACT_FRAGMENT_LIMIT = 16
+
+# 型を持つカラム（保存時・旧CSVからの移行時に変換する）
+DATE_COLUMNS = ["生まれた日", "日付"]
+TIME_COLUMNS = ["生まれた時間"]
+DATETIME_COLUMNS = ["日付時間"]
+NUMERIC_COLUMNS = ["生後日数", "グラム"]
+
+# メインのデータのうち、各ページで使うカラム
+PAGE_COLUMNS = {
+    "基本事項": ["生まれた日", "生まれた時間", "場所", "天気", "体重", "身長", "メッセージ"],
+    "手形": ["日付", "コメント"],
+    "初めてできたこと": ["日付", "曜日", "できたこと"],
+    "誕生日メッセージ": ["メッセージ"],
+}
+
+# 読み込み時のpandasの型（整数はnullを許容し、文字列はpyarrowのstring型にする）
+LOAD_TYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.string(): pd.StringDtype("pyarrow"),
+}
+
 # ディレクトリの作成（存在しない場合）
 os.makedirs(IMAGE_DIR, exist_ok=True)
 
@@ -28,7 +125,7 @@ st.set_page_config(
 st.markdown("""
     <style>
     /* ボタンデザイン - よりコントラストを強化 */
-    .stButton>button {
+    .stButton>button, .stFormSubmitButton>button {
         background-color: #4CAF50 !important;
         color: white !important;
         font-weight: bold;
@@ -59,12 +156,111 @@ def get_empty_dataframe(datatype):
     else:
         return pd.DataFrame()
 
+# パーティション分割されたデータセットの操作
+def _open_dataset(dataset_path):
+    """Parquetのデータセットをスキーマとパーティション付きで開く"""
+    schema = DATASET_SCHEMAS[dataset_path]
+    partitioning = ds.partitioning(
+        pa.schema([schema.field(col) for col in PARTITION_COLUMNS[dataset_path]]),
+        flavor="hive"
+    )
+    return ds.dataset(dataset_path, format="parquet", schema=schema, partitioning=partitioning)
+
+def _pet_key(pet_name):
+    """ペットの名前からパーティション用の固定長のキーを作る"""
+    return hashlib.blake2b(pet_name.encode("utf-8"), digest_size=16).hexdigest()
+
+def _partition_filter(pet_name, page_label=None):
+    """ペット（とページ）のパーティションを選ぶフィルタ式を返す"""
+    expr = ds.field("ペットキー") == _pet_key(pet_name)
+    if page_label is not None:
+        expr = expr & (ds.field("ページ") == page_label)
+    return expr
+
+def _dataframe_to_table(df, dataset_path):
+    """データフレームをデータセットのスキーマに合わせたArrowテーブルに変換する"""
+    schema = DATASET_SCHEMAS[dataset_path]
+    # 日付・日時は書き込み時に一度だけ変換し、読み込み時の再変換を不要にする
+    # 旧CSVは行ごとに書式が異なる（秒未満の有無など）ため、先頭行の書式に合わせず行ごとに解釈する
+    coerced = {}
+    for col in df.columns:
+        if col in DATE_COLUMNS:
+            coerced[col] = pd.to_datetime(df[col], format="mixed", errors="coerce").dt.date
+        elif col in DATETIME_COLUMNS:
+            coerced[col] = pd.to_datetime(df[col], format="mixed", errors="coerce")
+    # パーティション用のキーは名前から作る
+    if "名前" in df.columns:
+        coerced["ペットキー"] = df["名前"].map(_pet_key, na_action="ignore")
+    if coerced:
+        df = df.assign(**coerced)
+    # 存在しないカラムは型付きのnullで埋める
+    arrays = [
+        pa.array(df[field.name], type=field.type, from_pandas=True) if field.name in df.columns
+        else pa.nulls(len(df), field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+def _write_partitions(table, dataset_path, target_dir=None):
+    """Arrowテーブルをパーティションごとの新しいファイルとして書き込む（target_dirを指定するとそこへ書く）"""
+    # ファイルはファイル名の順に読まれるため、書き込んだ時刻を先頭に付けて保存した順に並ぶようにする
+    pq.write_to_dataset(
+        table,
+        target_dir or dataset_path,
+        partition_cols=PARTITION_COLUMNS[dataset_path],
+        basename_template=f"part-{time.time_ns()}-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        compression="zstd"
+    )
+
+# データセット読み込みのキャッシュ（保存時に破棄されるまで同じデータフレームを再利用）
+# cache_dataは戻り値をシリアライズしてコピーするため、cache_resourceでオブジェクトをそのまま共有する
+@st.cache_resource(show_spinner=False)
+def _load_cached(dataset_path, pet_name):
+    """データセットを読み込む"""
+    filter_expr = None if pet_name is None else _partition_filter(pet_name)
+    # パーティション用のキーは画面で使わないため読み込まない
+    columns = [name for name in DATASET_SCHEMAS[dataset_path].names if name != "ペットキー"]
+    table = _open_dataset(dataset_path).to_table(columns=columns, filter=filter_expr)
+    # 文字列はArrowのバッファのまま保持し、検索などをArrowの文字列処理で行う
+    return table.to_pandas(types_mapper=LOAD_TYPES.get)
+
+def _read_legacy_csv(csv_path):
+    """旧形式のCSVを読み込み、時刻・数値のカラムを変換する（日付・日時は書き込み時に変換）"""
+    # 大きめのバッファで読み込み、OS既定の小さな読み込み単位を避ける
+    with open(csv_path, "rb", buffering=1 << 20) as fh:
+        df = pd.read_csv(fh, dtype=str)
+    for col in df.columns:
+        if col in TIME_COLUMNS:
+            df[col] = pd.to_datetime(df[col], format="mixed", errors="coerce").dt.time
+        elif col in NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    return df
+
+def migrate_legacy_data(dataset_path, legacy_path):
+    """旧形式のCSVが残っている場合に一度だけ現在の形式へ変換する"""
+    if os.path.exists(dataset_path) or not os.path.exists(legacy_path):
+        return
+    # 途中で失敗しても移行済みと判定されないよう、一時ディレクトリに書いてから置き換える
+    os.makedirs(os.path.dirname(dataset_path), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".migrate-", dir=os.path.dirname(dataset_path))
+    try:
+        df = _read_legacy_csv(legacy_path)
+        _write_partitions(_dataframe_to_table(df, dataset_path), dataset_path, tmp_dir)
+        os.replace(tmp_dir, dataset_path)
+        logging.info(f"データを移行しました: {legacy_path} -> {dataset_path}")
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        import traceback
+        logging.error(f"データ移行エラー: {str(e)}\n{traceback.format_exc()}")
+
 # エラーハンドリング用の共通関数
-def safe_load_dataframe(file_path, datatype="main"):
-    """安全にデータフレームを読み込む関数"""
+def safe_load_dataframe(dataset_path, datatype="main", pet_name=None):
+    """安全にデータフレームを読み込む関数（pet_nameを指定するとそのパーティションだけを読む）"""
     try:
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
+        if os.path.exists(dataset_path):
+            # キャッシュ上のオブジェクトを書き換えないよう浅いコピーを返す
+            df = _load_cached(dataset_path, pet_name).copy(deep=False)
             # 必要なカラムが存在するか確認し、なければ追加
             empty_df = get_empty_dataframe(datatype)
             for col in empty_df.columns:
@@ -75,32 +271,103 @@ def safe_load_dataframe(file_path, datatype="main"):
             return get_empty_dataframe(datatype)
     except Exception as e:
         st.error("データの読み込み中にエラーが発生しました: " + str(e))
+        import traceback
         logging.error(f"データ読み込みエラー: {str(e)}\n{traceback.format_exc()}")
         return get_empty_dataframe(datatype)
 
-def safe_save_dataframe(df, file_path):
-    """安全にデータフレームを保存する関数"""
+def safe_save_dataframe(df, dataset_path, pet_name, page_label=None):
+    """指定したペット（とページ）のパーティションだけを安全に書き換える関数"""
     try:
-        df.to_csv(file_path, index=False)
+        old_fragments = []
+        if os.path.exists(dataset_path):
+            dataset = _open_dataset(dataset_path)
+            old_fragments = [f.path for f in dataset.get_fragments(filter=_partition_filter(pet_name, page_label))]
+
+        partition_values = {"名前": pet_name}
+        if page_label is not None:
+            partition_values["ページ"] = page_label
+        _write_partitions(_dataframe_to_table(df.assign(**partition_values), dataset_path), dataset_path)
+
+        # 新しいファイルを書き込めた後で古いファイルを削除
+        for fragment_path in old_fragments:
+            os.remove(fragment_path)
+        # 次回の読み込みで最新の内容を取得するため、このペットのキャッシュだけを破棄
+        _load_cached.clear(dataset_path, pet_name)
         return True
     except Exception as e:
         st.error("データの保存中にエラーが発生しました: " + str(e))
+        import traceback
         logging.error(f"データ保存エラー: {str(e)}\n{traceback.format_exc()}")
         return False
 
+def _compact_partition(dataset_path, pet_name):
+    """追記でファイルが増えたペットのパーティションを1つのファイルにまとめ直す"""
+    try:
+        dataset = _open_dataset(dataset_path)
+        partition = _partition_filter(pet_name)
+        fragments = [f.path for f in dataset.get_fragments(filter=partition)]
+        if len(fragments) <= COMPACT_FRAGMENT_LIMIT:
+            return
+        # 1行ずつの小さな塊を結合し、読み込み順のまま1つのファイルに書き込んでから元のファイルを削除
+        _write_partitions(dataset.to_table(filter=partition).combine_chunks(), dataset_path)
+        for fragment_path in fragments:
+            os.remove(fragment_path)
+    except Exception as e:
+        # 追記自体は完了しているため、まとめ直しの失敗はログに残すだけにする
+        import traceback
+        logging.error(f"パーティション統合エラー: {str(e)}\n{traceback.format_exc()}")
+
+def safe_append_records(records, dataset_path):
+    """既存のデータを読み込まずに新しいレコード（辞書のリスト）だけを追記する関数"""
+    try:
+        # データフレームを経由せず、辞書から直接Arrowテーブルを作る
+        records = [{**record, "ペットキー": _pet_key(record["名前"])} for record in records]
+        _write_partitions(pa.Table.from_pylist(records, schema=DATASET_SCHEMAS[dataset_path]), dataset_path)
+        for pet_name in {record["名前"] for record in records}:
+            _compact_partition(dataset_path, pet_name)
+            _load_cached.clear(dataset_path, pet_name)
+        return True
+    except Exception as e:
+        st.error("データの保存中にエラーが発生しました: " + str(e))
+        import traceback
+        logging.error(f"データ追記エラー: {str(e)}\n{traceback.format_exc()}")
+        return False
+
 def safe_save_image(uploaded_file, path):
-    """安全に画像を保存する関数"""
+    """安全に画像を保存する関数（同じ内容の画像は再保存しない）"""
     try:
         if uploaded_file is not None:
-            with open(path, "wb") as f:
-                f.write(uploaded_file.read())
+            data = uploaded_file.getvalue()
+            # 再実行のたびに同じ画像を書き込まないよう、内容のハッシュを記録しておく
+            hash_key = f"img_hash_{path}"
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if st.session_state.get(hash_key) == digest and os.path.exists(path):
+                return True
+            # 縮小・再圧縮してから保存（向きはEXIFに合わせて補正）
+            img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+            img.thumbnail(IMAGE_MAX_SIZE)
+            img.convert("RGB").save(path, "JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+            st.session_state[hash_key] = digest
             return True
         return False
     except Exception as e:
         st.error("画像の保存中にエラーが発生しました: " + str(e))
+        import traceback
         logging.error(f"画像保存エラー: {str(e)}\n{traceback.format_exc()}")
         return False
 
+# 画像読み込みのキャッシュ（更新時刻が変わるまで読み込んだバイト列を再利用）
+# 再保存のたびにキーが変わるため、件数を制限して古い画像がメモリに残り続けないようにする
+@st.cache_data(show_spinner=False, max_entries=IMAGE_CACHE_ENTRIES)
+def _load_image_cached(path, mtime):
+    """画像ファイルを読み込む（mtimeはキャッシュキーとしてのみ使用）"""
+    with open(path, "rb") as f:
+        return f.read()
+
+def load_image(path):
+    """表示用に画像を読み込む"""
+    return _load_image_cached(path, os.path.getmtime(path))
+
 # データフレームから安全に値を取得
 def safe_get_value(df, row_idx, col_name, default=""):
     """データフレームから安全に値を取得する"""
@@ -113,6 +380,23 @@ def safe_get_value(df, row_idx, col_name, default=""):
         logging.error(f"値の取得エラー: {str(e)}")
         return default
 
+# (名前, ページ)ごとに分けたデータの操作
+def group_journal(df):
+    """メインのデータフレームを(名前, ページ)をキーとする辞書に一度で分ける"""
+    return {key: group for key, group in df.groupby(["名前", "ページ"], sort=False)}
+
+def get_page_rows(journal_groups, pet_name, page_label):
+    """指定したペット・ページの行を、そのページで使うカラムだけに絞って取り出す"""
+    rows = journal_groups.get((pet_name, page_label), get_empty_dataframe("main"))
+    if page_label not in PAGE_COLUMNS:
+        return rows
+    # 空のデータフレームにはカラムがないため、reindexで不足分を補う
+    return rows.reindex(columns=["名前", "ページ"] + PAGE_COLUMNS[page_label])
+
+# 旧形式データの移行
+for data_file, legacy_file in LEGACY_FILES:
+    migrate_legacy_data(data_file, legacy_file)
+
 # セッション初期化
 if "pet_name" not in st.session_state:
     st.session_state.pet_name = None
@@ -125,9 +409,13 @@ if "lang" not in st.session_state:
 lang = st.sidebar.selectbox("🌐 言語 / Language", ["日本語", "English"])
 st.session_state.lang = lang
 
-# 翻訳関数
-def t(ja, en):
-    return ja if st.session_state.lang == "日本語" else en
+# 翻訳関数（言語の判定は再実行ごとに一度だけ行う）
+if st.session_state.lang == "日本語":
+    def t(ja, en):
+        return ja
+else:
+    def t(ja, en):
+        return en
 
 # メニュー表示
 def show_menu():
@@ -169,28 +457,25 @@ def editable_data(df_page, key_prefix, page_label):
         else:
             editable_df = df_page.copy()
             
-        edited = st.data_editor(editable_df, key=f"edit_table_{key_prefix}", use_container_width=True)
-        
-        if st.button(t("変更を保存", "Save Changes"), key=f"save_edit_{key_prefix}"):
-            df_all = safe_load_dataframe(SAVE_FILE)
+        # セルを編集するたびに再実行されないようフォームにまとめる
+        with st.form(key=f"edit_form_{key_prefix}"):
+            edited = st.data_editor(editable_df, key=f"edit_table_{key_prefix}", use_container_width=True)
             
-            new_df = df_page.copy()
-            for col in edited.columns:
-                new_df[col] = edited[col]
-                
-            # 安全にフィルタリング
-            try:
-                not_this_page = df_all[df_all["ページ"] != page_label]
-            except Exception as e:
-                logging.error(f"フィルタリングエラー: {str(e)}")
-                not_this_page = get_empty_dataframe("main")
-                
-            updated = pd.concat([not_this_page, new_df], ignore_index=True)
+            submit_button = st.form_submit_button(t("変更を保存", "Save Changes"))
             
-            if safe_save_dataframe(updated, SAVE_FILE):
-                st.success(t("✅ 変更を保存しました！", "✅ Changes saved!"))
+            if submit_button:
+                # 編集されたカラムを一括で差し替え
+                new_df = df_page.assign(**{col: edited[col] for col in edited.columns})
+                
+                # このペット・ページのパーティションだけを書き換える
+                if safe_save_dataframe(new_df, SAVE_DIR, st.session_state.pet_name, page_label):
+                    st.success(t("✅ 変更を保存しました！", "✅ Changes saved!"))
+                    if page_label == "基本事項":
+                        # 成長日記で保持している生まれた日を破棄
+                        st.session_state.pop(f"birth_date_{st.session_state.pet_name}", None)
     except Exception as e:
         st.error(t(f"エラーが発生しました: {str(e)}", f"An error occurred: {str(e)}"))
+        import traceback
         logging.error(f"データ編集エラー: {str(e)}\n{traceback.format_exc()}")
 
 # 名前入力画面
@@ -214,28 +499,41 @@ elif st.session_state.page == "main":
     st.markdown(f"## 🐶 {st.session_state.pet_name} のページ / {st.session_state.pet_name}'s Page")
 
     # メインのデータフレームを読み込み
-    df_save = safe_load_dataframe(SAVE_FILE, "main")
+    journal_groups = group_journal(safe_load_dataframe(SAVE_DIR, "main", st.session_state.pet_name))
 
     # ページ 1: 写真ページ
     if selected == t("1. 写真ページ", "1. Photo Page"):
         st.header(t("📸 生まれたときの写真", "📸 Photos from Birth"))
         
+        path1 = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_photo1.jpg")
+        path2 = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_photo2.jpg")
+        
+        # 写真の選択はフォームにまとめ、保存ボタンを押したときだけ処理する
+        with st.form(key="photo_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                photo1 = st.file_uploader(t("1枚目の写真を選択", "Select the first photo"), 
+                                          type=["jpg", "jpeg", "png"], key="photo1")
+            with col2:
+                photo2 = st.file_uploader(t("2枚目の写真を選択", "Select the second photo"), 
+                                          type=["jpg", "jpeg", "png"], key="photo2")
+            
+            submit_button = st.form_submit_button(t("保存する", "Save"))
+            
+            if submit_button:
+                saved1 = safe_save_image(photo1, path1)
+                saved2 = safe_save_image(photo2, path2)
+                if saved1 or saved2:
+                    st.success(t("✅ 写真を保存しました！", "✅ Photos saved!"))
+        
+        # 保存済みの写真を表示
         col1, col2 = st.columns(2)
         with col1:
-            photo1 = st.file_uploader(t("1枚目の写真を選択", "Select the first photo"), 
-                                      type=["jpg", "jpeg", "png"], key="photo1")
-            if photo1 is not None:
-                path1 = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_photo1.jpg")
-                if safe_save_image(photo1, path1):
-                    st.image(path1, caption=t("📷 1枚目", "📷 Photo 1"), use_container_width=True)
-        
+            if os.path.exists(path1):
+                st.image(load_image(path1), caption=t("📷 1枚目", "📷 Photo 1"), use_container_width=True)
         with col2:
-            photo2 = st.file_uploader(t("2枚目の写真を選択", "Select the second photo"), 
-                                      type=["jpg", "jpeg", "png"], key="photo2")
-            if photo2 is not None:
-                path2 = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_photo2.jpg")
-                if safe_save_image(photo2, path2):
-                    st.image(path2, caption=t("📷 2枚目", "📷 Photo 2"), use_container_width=True)
+            if os.path.exists(path2):
+                st.image(load_image(path2), caption=t("📷 2枚目", "📷 Photo 2"), use_container_width=True)
 
     # ページ 2: 基本事項
     elif selected == t("2. 基本事項", "2. Basic Info"):
@@ -243,8 +541,7 @@ elif st.session_state.page == "main":
 
         # 既存のデータを安全に取得
         try:
-            existing_data = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                  (df_save["ページ"] == "基本事項")]
+            existing_data = get_page_rows(journal_groups, st.session_state.pet_name, "基本事項")
         except Exception as e:
             logging.error(f"基本情報フィルタリングエラー: {str(e)}")
             existing_data = pd.DataFrame()
@@ -259,8 +556,8 @@ elif st.session_state.page == "main":
         
         if not existing_data.empty:
             try:
-                default_birth_date = pd.to_datetime(safe_get_value(existing_data, 0, "生まれた日", default_birth_date)).date()
-                default_birth_time = pd.to_datetime(safe_get_value(existing_data, 0, "生まれた時間", default_birth_time)).time()
+                default_birth_date = safe_get_value(existing_data, 0, "生まれた日", default_birth_date)
+                default_birth_time = safe_get_value(existing_data, 0, "生まれた時間", default_birth_time)
                 default_birth_place = safe_get_value(existing_data, 0, "場所", "")
                 default_weather = safe_get_value(existing_data, 0, "天気", "")
                 default_birth_weight = safe_get_value(existing_data, 0, "体重", "")
@@ -269,53 +566,44 @@ elif st.session_state.page == "main":
             except Exception as e:
                 logging.error(f"既存データの読み込みエラー: {str(e)}")
         
-        col1, col2 = st.columns(2)
-        with col1:
-            birth_date = st.date_input(t("生まれた日", "Date of Birth"), value=default_birth_date)
-            birth_time = st.time_input(t("生まれた時間", "Time of Birth"), value=default_birth_time)
-            birth_place = st.text_input(t("生まれた場所", "Place of Birth"), value=default_birth_place)
-            weather = st.text_input(t("その日の天気", "Weather on the day"), value=default_weather)
-        with col2:
-            birth_weight = st.text_input(t("出生時の体重", "Birth Weight"), value=default_birth_weight)
-            birth_height = st.text_input(t("出生時の身長", "Birth Height"), value=default_birth_height)
-
-        message = st.text_area(t("🐾 ペットへのメッセージ", "🐾 Message to your pet"), value=default_message)
-
-        if st.button(t("保存する", "Save"), key="save_basic"):
-            df_new = pd.DataFrame([{
-                "名前": st.session_state.pet_name,
-                "ページ": "基本事項",
-                "生まれた日": birth_date,
-                "生まれた時間": birth_time,
-                "場所": birth_place,
-                "天気": weather,
-                "体重": birth_weight,
-                "身長": birth_height,
-                "メッセージ": message
-            }])
-            
-            # 既存の行を削除し、新しいデータを追加
-            try:
-                df_filtered = df_save[(df_save["名前"] != st.session_state.pet_name) | 
-                                    (df_save["ページ"] != "基本事項")]
-            except Exception as e:
-                logging.error(f"フィルタリングエラー: {str(e)}")
-                df_filtered = get_empty_dataframe("main")
+        with st.form(key="basic_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                birth_date = st.date_input(t("生まれた日", "Date of Birth"), value=default_birth_date)
+                birth_time = st.time_input(t("生まれた時間", "Time of Birth"), value=default_birth_time)
+                birth_place = st.text_input(t("生まれた場所", "Place of Birth"), value=default_birth_place)
+                weather = st.text_input(t("その日の天気", "Weather on the day"), value=default_weather)
+            with col2:
+                birth_weight = st.text_input(t("出生時の体重", "Birth Weight"), value=default_birth_weight)
+                birth_height = st.text_input(t("出生時の身長", "Birth Height"), value=default_birth_height)
+
+            message = st.text_area(t("🐾 ペットへのメッセージ", "🐾 Message to your pet"), value=default_message)
+
+            submit_button = st.form_submit_button(t("保存する", "Save"))
+
+            if submit_button:
+                df_new = pd.DataFrame([{
+                    "名前": st.session_state.pet_name,
+                    "ページ": "基本事項",
+                    "生まれた日": birth_date,
+                    "生まれた時間": birth_time,
+                    "場所": birth_place,
+                    "天気": weather,
+                    "体重": birth_weight,
+                    "身長": birth_height,
+                    "メッセージ": message
+                }])
                 
-            df_all = pd.concat([df_filtered, df_new], ignore_index=True)
-            
-            if safe_save_dataframe(df_all, SAVE_FILE):
-                st.success(t("✅ 保存しました！", "✅ Saved!"))
+                # このペット・ページのパーティションだけを書き換える
+                if safe_save_dataframe(df_new, SAVE_DIR, st.session_state.pet_name, "基本事項"):
+                    st.success(t("✅ 保存しました！", "✅ Saved!"))
+                    # 成長日記で保持している生まれた日を破棄
+                    st.session_state.pop(f"birth_date_{st.session_state.pet_name}", None)
+                    # 保存した行で表示中のデータを置き換える（再読み込みしない）
+                    existing_data = df_new
         
         # 編集可能データの表示
-        try:
-            editable_df = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                (df_save["ページ"] == "基本事項")]
-        except Exception as e:
-            logging.error(f"フィルタリングエラー: {str(e)}")
-            editable_df = pd.DataFrame()
-            
-        editable_data(editable_df, "basic", "基本事項")
+        editable_data(existing_data, "basic", "基本事項")
 
     # ページ 3: 手形の記録
     elif selected == t("3. 手形の記録", "3. Handprint"):
@@ -323,8 +611,7 @@ elif st.session_state.page == "main":
 
         # 既存データを安全に取得
         try:
-            existing_hand = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                  (df_save["ページ"] == "手形")]
+            existing_hand = get_page_rows(journal_groups, st.session_state.pet_name, "手形")
         except Exception as e:
             logging.error(f"手形データフィルタリングエラー: {str(e)}")
             existing_hand = pd.DataFrame()
@@ -334,58 +621,51 @@ elif st.session_state.page == "main":
         
         if not existing_hand.empty:
             try:
-                default_hand_date = pd.to_datetime(safe_get_value(existing_hand, 0, "日付", default_hand_date)).date()
+                default_hand_date = safe_get_value(existing_hand, 0, "日付", default_hand_date)
                 default_hand_comment = safe_get_value(existing_hand, 0, "コメント", "")
             except Exception as e:
                 logging.error(f"手形データの読み込みエラー: {str(e)}")
 
-        hand_photo = st.file_uploader(
-            t("📸 手形の写真をアップロード", "📸 Upload handprint photo"), 
-            type=["jpg", "jpeg", "png"], 
-            key="hand"
-        )
-        
-        hand_date = st.date_input(t("撮影日", "Date of Photo"), value=default_hand_date)
-        hand_comment = st.text_area(t("コメント", "Comment"), value=default_hand_comment)
-
-        # 既存の画像があれば表示
         hand_path = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_hand.jpg")
-        if hand_photo:
-            if safe_save_image(hand_photo, hand_path):
-                st.image(hand_path, caption=t("✋ 手形写真", "✋ Handprint Photo"), use_container_width=True)
-        elif os.path.exists(hand_path):
-            st.image(hand_path, caption=t("✋ 保存済みの手形写真", "✋ Saved Handprint Photo"), use_container_width=True)
-
-        if st.button(t("保存する", "Save"), key="save_hand"):
-            df_new = pd.DataFrame([{
-                "名前": st.session_state.pet_name,
-                "ページ": "手形",
-                "日付": hand_date,
-                "コメント": hand_comment
-            }])
+
+        with st.form(key="hand_form"):
+            hand_photo = st.file_uploader(
+                t("📸 手形の写真をアップロード", "📸 Upload handprint photo"), 
+                type=["jpg", "jpeg", "png"], 
+                key="hand"
+            )
             
-            # 既存の行を削除し、新しいデータを追加
-            try:
-                df_filtered = df_save[(df_save["名前"] != st.session_state.pet_name) | 
-                                    (df_save["ページ"] != "手形")]
-            except Exception as e:
-                logging.error(f"フィルタリングエラー: {str(e)}")
-                df_filtered = get_empty_dataframe("main")
+            hand_date = st.date_input(t("撮影日", "Date of Photo"), value=default_hand_date)
+            hand_comment = st.text_area(t("コメント", "Comment"), value=default_hand_comment)
+
+            submit_button = st.form_submit_button(t("保存する", "Save"))
+
+            if submit_button:
+                # 写真がアップロードされた場合のみ、保存できたかを確認する
+                photo_saved = hand_photo is None or safe_save_image(hand_photo, hand_path)
+                df_new = pd.DataFrame([{
+                    "名前": st.session_state.pet_name,
+                    "ページ": "手形",
+                    "日付": hand_date,
+                    "コメント": hand_comment
+                }])
                 
-            df_all = pd.concat([df_filtered, df_new], ignore_index=True)
-            
-            if safe_save_dataframe(df_all, SAVE_FILE):
-                st.success(t("✅ 手形情報を保存しました！", "✅ Handprint saved!"))
+                # このペット・ページのパーティションだけを書き換える
+                if safe_save_dataframe(df_new, SAVE_DIR, st.session_state.pet_name, "手形"):
+                    if photo_saved:
+                        st.success(t("✅ 手形情報を保存しました！", "✅ Handprint saved!"))
+                    else:
+                        st.warning(t("⚠️ 日付とコメントは保存しましたが、写真は保存できませんでした。", 
+                                     "⚠️ Date and comment were saved, but the photo could not be saved."))
+                    # 保存した行で表示中のデータを置き換える（再読み込みしない）
+                    existing_hand = df_new
+
+        # 保存済みの画像があれば表示
+        if os.path.exists(hand_path):
+            st.image(load_image(hand_path), caption=t("✋ 保存済みの手形写真", "✋ Saved Handprint Photo"), use_container_width=True)
 
         # 編集可能データの表示
-        try:
-            editable_df = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                (df_save["ページ"] == "手形")]
-        except Exception as e:
-            logging.error(f"フィルタリングエラー: {str(e)}")
-            editable_df = pd.DataFrame()
-            
-        editable_data(editable_df, "hand", "手形")
+        editable_data(existing_hand, "hand", "手形")
 
     # ページ 4: 初めてできたこと
     elif selected == t("4. 初めてできたこと", "4. First Milestones"):
@@ -393,12 +673,18 @@ elif st.session_state.page == "main":
 
         # 既存データを安全に取得
         try:
-            existing_firsts = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                    (df_save["ページ"] == "初めてできたこと")]
+            existing_firsts = get_page_rows(journal_groups, st.session_state.pet_name, "初めてできたこと")
         except Exception as e:
             logging.error(f"初めてできたことデータフィルタリングエラー: {str(e)}")
             existing_firsts = pd.DataFrame()
         
+        # 既存の「できたこと」を一度だけリスト化し、入力欄の数まで空文字で埋める
+        if "できたこと" in existing_firsts.columns:
+            existing_what = existing_firsts["できたこと"].fillna("").tolist()
+        else:
+            existing_what = []
+        existing_what += [""] * 5
+        
         records = []
         with st.form(key="milestone_form"):
             for i in range(5):  # 入力フォームを5つに減らし、フォームで囲む
@@ -413,12 +699,7 @@ elif st.session_state.page == "main":
                 
                 with col2:
                     # 既存データがあれば、それを初期値として表示
-                    default_what = ""
-                    if not existing_firsts.empty and i < len(existing_firsts):
-                        try:
-                            default_what = safe_get_value(existing_firsts, i, "できたこと", "")
-                        except Exception as e:
-                            logging.error(f"既存データ取得エラー: {str(e)}")
+                    default_what = existing_what[i]
                     
                     what = st.text_input(
                         t(f"できたこと{i+1}", f"What they did {i+1}"), 
@@ -440,18 +721,11 @@ elif st.session_state.page == "main":
             if submit_button and records:
                 df_new = pd.DataFrame(records)
                 
-                # 既存の行を削除し、新しいデータを追加
-                try:
-                    df_filtered = df_save[(df_save["名前"] != st.session_state.pet_name) | 
-                                        (df_save["ページ"] != "初めてできたこと")]
-                except Exception as e:
-                    logging.error(f"フィルタリングエラー: {str(e)}")
-                    df_filtered = get_empty_dataframe("main")
-                    
-                df_all = pd.concat([df_filtered, df_new], ignore_index=True)
-                
-                if safe_save_dataframe(df_all, SAVE_FILE):
+                # このペット・ページのパーティションだけを書き換える
+                if safe_save_dataframe(df_new, SAVE_DIR, st.session_state.pet_name, "初めてできたこと"):
                     st.success(t("✅ 初めてできたことを保存しました！", "✅ First milestones saved!"))
+                    # 保存した行で表示中のデータを置き換える（再読み込みしない）
+                    existing_firsts = df_new
         
         # 追加の項目が必要な場合はこちらから入力
         with st.expander(t("🔍 さらに記録を追加", "🔍 Add more records")):
@@ -471,8 +745,7 @@ elif st.session_state.page == "main":
 
         # 既存データを安全に取得
         try:
-            existing_bday = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                   (df_save["ページ"] == "誕生日メッセージ")]
+            existing_bday = get_page_rows(journal_groups, st.session_state.pet_name, "誕生日メッセージ")
         except Exception as e:
             logging.error(f"誕生日メッセージデータフィルタリングエラー: {str(e)}")
             existing_bday = pd.DataFrame()
@@ -486,83 +759,77 @@ elif st.session_state.page == "main":
             except Exception as e:
                 logging.error(f"誕生日メッセージの読み込みエラー: {str(e)}")
 
-        birthday_photo = st.file_uploader(
-            t("🎉 写真をアップロード", "🎉 Upload a birthday photo"),
-            type=["jpg", "jpeg", "png"],
-            key="bday"
-        )
-        
-        birthday_msg = st.text_area(
-            t("🎁 ペットへのメッセージ", "🎁 Message to your pet"), 
-            value=default_bday_msg
-        )
-
-        # 既存の画像があれば表示、新しくアップロードされた場合は保存して表示
         bday_path = os.path.join(IMAGE_DIR, f"{st.session_state.pet_name}_bday.jpg")
-        
-        if birthday_photo:
-            if safe_save_image(birthday_photo, bday_path):
-                st.subheader("🎉 " + t("誕生日写真", "Birthday Photo"))
-                st.image(bday_path, use_container_width=True)
-        elif os.path.exists(bday_path):
-            st.subheader("🎉 " + t("保存済みの誕生日写真", "Saved Birthday Photo"))
-            st.image(bday_path, use_container_width=True)
-
-        if st.button(t("保存する", "Save"), key="save_birthday"):
-            df_new = pd.DataFrame([{
-                "名前": st.session_state.pet_name,
-                "ページ": "誕生日メッセージ",
-                "メッセージ": birthday_msg if birthday_msg else ""  # 明示的に空文字列を設定
-            }])
+
+        with st.form(key="bday_form"):
+            birthday_photo = st.file_uploader(
+                t("🎉 写真をアップロード", "🎉 Upload a birthday photo"),
+                type=["jpg", "jpeg", "png"],
+                key="bday"
+            )
             
-            # 既存の行を削除し、新しいデータを追加
-            try:
-                df_filtered = df_save[(df_save["名前"] != st.session_state.pet_name) | 
-                                    (df_save["ページ"] != "誕生日メッセージ")]
-            except Exception as e:
-                logging.error(f"フィルタリングエラー: {str(e)}")
-                df_filtered = get_empty_dataframe("main")
+            birthday_msg = st.text_area(
+                t("🎁 ペットへのメッセージ", "🎁 Message to your pet"), 
+                value=default_bday_msg
+            )
+
+            submit_button = st.form_submit_button(t("保存する", "Save"))
+
+            if submit_button:
+                # 写真がアップロードされた場合のみ、保存できたかを確認する
+                photo_saved = birthday_photo is None or safe_save_image(birthday_photo, bday_path)
+                df_new = pd.DataFrame([{
+                    "名前": st.session_state.pet_name,
+                    "ページ": "誕生日メッセージ",
+                    "メッセージ": birthday_msg if birthday_msg else ""  # 明示的に空文字列を設定
+                }])
                 
-            df_all = pd.concat([df_filtered, df_new], ignore_index=True)
-            
-            if safe_save_dataframe(df_all, SAVE_FILE):
-                st.success(t("✅ 誕生日の記録を保存しました！", "✅ Birthday message saved!"))
+                # このペット・ページのパーティションだけを書き換える
+                if safe_save_dataframe(df_new, SAVE_DIR, st.session_state.pet_name, "誕生日メッセージ"):
+                    if photo_saved:
+                        st.success(t("✅ 誕生日の記録を保存しました！", "✅ Birthday message saved!"))
+                    else:
+                        st.warning(t("⚠️ メッセージは保存しましたが、写真は保存できませんでした。", 
+                                     "⚠️ The message was saved, but the photo could not be saved."))
+                    # 保存した行で表示中のデータを置き換える（再読み込みしない）
+                    existing_bday = df_new
+
+        # 保存済みの画像があれば表示
+        if os.path.exists(bday_path):
+            st.subheader("🎉 " + t("保存済みの誕生日写真", "Saved Birthday Photo"))
+            st.image(load_image(bday_path), use_container_width=True)
 
         # 編集可能データの表示
-        try:
-            editable_df = df_save[(df_save["名前"] == st.session_state.pet_name) & 
-                                (df_save["ページ"] == "誕生日メッセージ")]
-        except Exception as e:
-            logging.error(f"フィルタリングエラー: {str(e)}")
-            editable_df = pd.DataFrame()
-            
-        editable_data(editable_df, "bday", "誕生日メッセージ")
+        editable_data(existing_bday, "bday", "誕生日メッセージ")
 
     # ページ 7: 成長日記
     elif selected == t("7. 成長日記", "7. Growth Diary"):
         st.header(t("🗓 成長日記", "🗓 Growth Diary"))
 
-        # 生まれた日を安全に取得
-        birth_date = None
-        try:
-            birth_row = df_save[(df_save["名前"] == st.session_state.pet_name) & (df_save["ページ"] == "基本事項")]
-            
-            if not birth_row.empty:
-                try:
-                    birth_date_str = safe_get_value(birth_row, 0, "生まれた日", None)
-                    if birth_date_str:
-                        birth_date = pd.to_datetime(birth_date_str)
-                except Exception as e:
-                    st.warning(t("⚠️ 基本情報に生まれた日が正しく保存されていません。正しい形式で再入力してください。", 
-                                "⚠️ Birth date is not correctly saved in basic info. Please re-enter in correct format."))
-                    logging.error(f"生まれた日の読み込みエラー: {str(e)}")
-            else:
-                st.warning(t("⚠️ 基本情報に生まれた日が保存されていません。基本情報ページで設定してください。", 
-                            "⚠️ Birth date not found in basic info. Please set it in Basic Info page."))
-        except Exception as e:
-            logging.error(f"基本情報の取得エラー: {str(e)}")
-            st.warning(t("⚠️ 基本情報の取得中にエラーが発生しました。", 
-                        "⚠️ An error occurred while retrieving basic info."))
+        # 生まれた日を安全に取得（基本情報が保存されるまでセッションに保持して再利用）
+        birth_date_key = f"birth_date_{st.session_state.pet_name}"
+        birth_date = st.session_state.get(birth_date_key)
+        if birth_date is None:
+            try:
+                birth_row = get_page_rows(journal_groups, st.session_state.pet_name, "基本事項")
+                
+                if not birth_row.empty:
+                    try:
+                        # 保存時にdate型へ変換済みのため、そのまま使う
+                        birth_date = safe_get_value(birth_row, 0, "生まれた日", None)
+                        if birth_date:
+                            st.session_state[birth_date_key] = birth_date
+                    except Exception as e:
+                        st.warning(t("⚠️ 基本情報に生まれた日が正しく保存されていません。正しい形式で再入力してください。", 
+                                    "⚠️ Birth date is not correctly saved in basic info. Please re-enter in correct format."))
+                        logging.error(f"生まれた日の読み込みエラー: {str(e)}")
+                else:
+                    st.warning(t("⚠️ 基本情報に生まれた日が保存されていません。基本情報ページで設定してください。", 
+                                "⚠️ Birth date not found in basic info. Please set it in Basic Info page."))
+            except Exception as e:
+                logging.error(f"基本情報の取得エラー: {str(e)}")
+                st.warning(t("⚠️ 基本情報の取得中にエラーが発生しました。", 
+                            "⚠️ An error occurred while retrieving basic info."))
         
         # 成長日記入力フォーム
         with st.form(key="growth_diary_form"):
@@ -573,7 +840,7 @@ elif st.session_state.page == "main":
             days_old = None
             if birth_date:
                 try:
-                    days_old = (dt.date() - birth_date.date()).days
+                    days_old = (dt.date() - birth_date).days
                     st.markdown(t(f"**🐣 生後 {days_old} 日目の記録**", f"**🐣 Day {days_old} since birth**"))
                 except Exception as e:
                     logging.error(f"日数計算エラー: {str(e)}")
@@ -594,100 +861,99 @@ elif st.session_state.page == "main":
             if submit_button:
                 # 日記の保存処理
                 try:
-                    new_log = pd.DataFrame([{
+                    new_log = {
                         "名前": st.session_state.pet_name,
                         "日付時間": dt,
-                        "生後日数": days_old if days_old is not None else "",
+                        "生後日数": days_old,
                         "食事内容": meal if meal else "",
                         "グラム": meal_grams,
                         "おしっこ・うんち": potty if potty else "",
                         "散歩": walk if walk else "",
                         "睡眠": sleep if sleep else "",
                         "MEMO": memo if memo else ""
-                    }])
-                    
-                    # 既存のログファイルがあれば読み込む
-                    if os.path.exists(GROWTH_LOG_FILE):
-                        old_log = safe_load_dataframe(GROWTH_LOG_FILE, "growth")
-                        full_log = pd.concat([old_log, new_log], ignore_index=True)
-                    else:
-                        full_log = new_log
+                    }
                     
-                    if safe_save_dataframe(full_log, GROWTH_LOG_FILE):
+                    # 同じ内容の記録を続けて保存しないよう、直近に保存した記録のハッシュを保持
+                    growth_seen = st.session_state.setdefault("growth_seen", deque(maxlen=512))
+                    record_key = hash((st.session_state.pet_name, dt.strftime("%Y-%m-%d %H:%M"),
+                                       meal, meal_grams, potty, walk, sleep, memo))
+                    if record_key in growth_seen:
+                        st.info(t("ℹ️ この記録はすでに保存されています", "ℹ️ This record has already been saved"))
+                    # 既存のログは読み込まずに追記する
+                    elif safe_append_records([new_log], GROWTH_LOG_DIR):
+                        growth_seen.append(record_key)
                         st.success(t("✅ 記録を保存しました！", "✅ Record saved!"))
                 except Exception as e:
                     st.error(t(f"エラーが発生しました: {str(e)}", f"An error occurred: {str(e)}"))
+                    import traceback
                     logging.error(f"成長記録保存エラー: {str(e)}\n{traceback.format_exc()}")
             
         # 🔍 成長記録の表示・編集
         st.divider()
         st.subheader(t("🔍 保存された成長記録", "🔍 Saved Growth Records"))
         
-        if os.path.exists(GROWTH_LOG_FILE):
+        if os.path.exists(GROWTH_LOG_DIR):
             try:
-                df_growth = safe_load_dataframe(GROWTH_LOG_FILE, "growth")
-                if df_growth.empty:
-                    st.info(t("📭 まだ記録がありません", "📭 No records yet"))
+                # このペットのパーティションだけを読み込む
+                filtered_growth = safe_load_dataframe(GROWTH_LOG_DIR, "growth", st.session_state.pet_name)
+                if filtered_growth.empty:
+                    st.info(t("📭 このペットの記録はまだありません", "📭 No records for this pet yet"))
                 else:
-                    # データの前処理
-                    try:
-                        df_growth["日付時間"] = pd.to_datetime(df_growth["日付時間"], errors='coerce')
-                        filtered_growth = df_growth[df_growth["名前"] == st.session_state.pet_name]
-                    except Exception as e:
-                        logging.error(f"データ前処理エラー: {str(e)}")
-                        filtered_growth = pd.DataFrame()
+                    # タブでフィルタと編集を分ける
+                    tab1, tab2 = st.tabs([
+                        t("🔍 記録を検索・表示", "🔍 Search & View Records"),
+                        t("✏️ 記録を編集", "✏️ Edit Records")
+                    ])
                     
-                    if filtered_growth.empty:
-                        st.info(t("📭 このペットの記録はまだありません", "📭 No records for this pet yet"))
-                    else:
-                        # タブでフィルタと編集を分ける
-                        tab1, tab2 = st.tabs([
-                            t("🔍 記録を検索・表示", "🔍 Search & View Records"),
-                            t("✏️ 記録を編集", "✏️ Edit Records")
-                        ])
+                    with tab1:
+                        # 検索フィルタ
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            date_filter = st.date_input(
+                                t("📅 表示したい日付", "📅 Filter by date"),
+                                value=[],
+                                key="date_filter"
+                            )
+                        with col2:
+                            keyword = st.text_input(
+                                t("🔍 キーワード検索", "🔍 Keyword search"),
+                                key="keyword_filter"
+                            )
                         
-                        with tab1:
-                            # 検索フィルタ
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                date_filter = st.date_input(
-                                    t("📅 表示したい日付", "📅 Filter by date"),
-                                    value=[],
-                                    key="date_filter"
-                                )
-                            with col2:
-                                keyword = st.text_input(
-                                    t("🔍 キーワード検索", "🔍 Keyword search"),
-                                    key="keyword_filter"
-                                )
-                            
-                            filtered_df = filtered_growth.copy()
-                            
-                            # 日付フィルタの適用
-                            if date_filter:
-                                try:
-                                    filtered_df = filtered_df[filtered_df["日付時間"].dt.date.isin(date_filter)]
-                                except Exception as e:
-                                    logging.error(f"日付フィルタエラー: {str(e)}")
-                            
-                            # キーワードフィルタの適用
-                            if keyword:
-                                try:
-                                    filtered_df = filtered_df[filtered_df.astype(str).apply(
-                                        lambda row: keyword.lower() in ' '.join(row.values.astype(str)).lower(), axis=1
-                                    )]
-                                except Exception as e:
-                                    logging.error(f"キーワードフィルタエラー: {str(e)}")
-                            
-                            # 結果の表示
-                            if not filtered_df.empty:
-                                st.dataframe(filtered_df, use_container_width=True)
-                            else:
-                                st.info(t("🔍 条件に一致する記録が見つかりませんでした", 
-                                          "🔍 No records found matching your criteria"))
+                        filtered_df = filtered_growth.copy()
+                        
+                        # 日付フィルタの適用
+                        if date_filter:
+                            try:
+                                filtered_df = filtered_df[filtered_df["日付時間"].dt.date.isin(date_filter)]
+                            except Exception as e:
+                                logging.error(f"日付フィルタエラー: {str(e)}")
                         
-                        with tab2:
+                        # キーワードフィルタの適用
+                        if keyword:
                             try:
+                                # 行ごとのapplyではなく、カラム単位のベクトル演算で検索する
+                                mask = pd.Series(False, index=filtered_df.index)
+                                for col in filtered_df.columns:
+                                    values = filtered_df[col]
+                                    # string型のカラムは文字列変換せずにそのまま検索する
+                                    if not isinstance(values.dtype, pd.StringDtype):
+                                        values = values.astype(str)
+                                    mask |= values.str.contains(keyword, case=False, regex=False, na=False)
+                                filtered_df = filtered_df[mask]
+                            except Exception as e:
+                                logging.error(f"キーワードフィルタエラー: {str(e)}")
+                        
+                        # 結果の表示
+                        if not filtered_df.empty:
+                            st.dataframe(filtered_df, use_container_width=True)
+                        else:
+                            st.info(t("🔍 条件に一致する記録が見つかりませんでした", 
+                                      "🔍 No records found matching your criteria"))
+                    
+                    with tab2:
+                        try:
+                            with st.form(key="growth_edit_form"):
                                 edited = st.data_editor(
                                     filtered_growth, 
                                     num_rows="dynamic", 
@@ -695,26 +961,28 @@ elif st.session_state.page == "main":
                                     key="growth_editor"
                                 )
                                 
-                                if st.button(t("変更を保存する", "Save Changes"), key="save_growth_edit"):
-                                    # 全体のログから該当ペットの記録を削除し、編集された記録を追加
+                                submit_button = st.form_submit_button(t("変更を保存する", "Save Changes"))
+                                
+                                if submit_button:
+                                    # 該当ペットのパーティションだけを編集された記録で書き換える
                                     try:
-                                        full_log = safe_load_dataframe(GROWTH_LOG_FILE, "growth")
-                                        others = full_log[full_log["名前"] != st.session_state.pet_name]
-                                        combined = pd.concat([others, edited], ignore_index=True)
-                                        
-                                        if safe_save_dataframe(combined, GROWTH_LOG_FILE):
+                                        if safe_save_dataframe(edited, GROWTH_LOG_DIR, st.session_state.pet_name):
                                             st.success(t("✅ 編集内容を保存しました！", "✅ Changes saved!"))
+                                            # 削除・変更された記録を再入力できるよう、保存済みの記録の履歴を破棄
+                                            st.session_state.pop("growth_seen", None)
                                     except Exception as e:
                                         st.error(t(f"エラーが発生しました: {str(e)}", f"An error occurred: {str(e)}"))
+                                        import traceback
                                         logging.error(f"成長記録編集エラー: {str(e)}\n{traceback.format_exc()}")
-                            except Exception as e:
-                                st.error(t(f"データエディタの表示中にエラーが発生しました: {str(e)}", 
-                                           f"An error occurred while displaying data editor: {str(e)}"))
-                                logging.error(f"データエディタエラー: {str(e)}")
-                                    
+                        except Exception as e:
+                            st.error(t(f"データエディタの表示中にエラーが発生しました: {str(e)}", 
+                                       f"An error occurred while displaying data editor: {str(e)}"))
+                            logging.error(f"データエディタエラー: {str(e)}")
+                                
             except Exception as e:
                 st.error(t(f"データの読み込み中にエラーが発生しました: {str(e)}", 
                            f"An error occurred while loading data: {str(e)}"))
+                import traceback
                 logging.error(f"成長記録読み込みエラー: {str(e)}\n{traceback.format_exc()}")
         else:
             st.info(t("📝 まだ記録がありません。上のフォームから記録を追加してください。", 
@@ -727,15 +995,13 @@ elif st.session_state.page == "main":
         # 既存のメモを取得
         existing_memo = ""
         
-        if os.path.exists(MEMO_LOG_FILE):
+        if os.path.exists(MEMO_LOG_DIR):
             try:
-                memo_df = safe_load_dataframe(MEMO_LOG_FILE, "memo")
-                memo_entries = memo_df[memo_df["名前"] == st.session_state.pet_name]
+                memo_entries = safe_load_dataframe(MEMO_LOG_DIR, "memo", st.session_state.pet_name)
                 
                 if not memo_entries.empty:
                     try:
                         # 最新のメモを表示
-                        memo_entries["日付"] = pd.to_datetime(memo_entries["日付"], errors='coerce')
                         memo_entries = memo_entries.sort_values("日付", ascending=False)
                         if len(memo_entries) > 0:
                             existing_memo = safe_get_value(memo_entries, 0, "メモ", "")
@@ -756,28 +1022,24 @@ elif st.session_state.page == "main":
             
             if submit_button:
                 try:
-                    memo_df = pd.DataFrame([{
+                    new_memo = {
                         "名前": st.session_state.pet_name,
                         "ページ": "メモ欄",
                         "日付": date.today(),
                         "メモ": memo_input if memo_input else ""  # 明示的に空文字列を設定
-                    }])
-                    
-                    if os.path.exists(MEMO_LOG_FILE):
-                        existing = safe_load_dataframe(MEMO_LOG_FILE, "memo")
-                        memo_df = pd.concat([existing, memo_df], ignore_index=True)
+                    }
                     
-                    if safe_save_dataframe(memo_df, MEMO_LOG_FILE):
+                    if safe_append_records([new_memo], MEMO_LOG_DIR):
                         st.success(t("✅ メモを保存しました！", "✅ Memo saved!"))
                 except Exception as e:
                     st.error(t(f"エラーが発生しました: {str(e)}", f"An error occurred: {str(e)}"))
+                    import traceback
                     logging.error(f"メモ保存エラー: {str(e)}\n{traceback.format_exc()}")
 
         # メモの履歴表示
-        if os.path.exists(MEMO_LOG_FILE):
+        if os.path.exists(MEMO_LOG_DIR):
             try:
-                df_memo = safe_load_dataframe(MEMO_LOG_FILE, "memo")
-                df_memo = df_memo[df_memo["名前"] == st.session_state.pet_name]
+                df_memo = safe_load_dataframe(MEMO_LOG_DIR, "memo", st.session_state.pet_name)
                 
                 if not df_memo.empty:
                     st.divider()
@@ -785,7 +1047,6 @@ elif st.session_state.page == "main":
                     
                     try:
                         # 日付でソート
-                        df_memo["日付"] = pd.to_datetime(df_memo["日付"], errors='coerce')
                         df_memo = df_memo.sort_values("日付", ascending=False)
                     except Exception as e:
                         logging.error(f"メモソートエラー: {str(e)}")
@@ -795,6 +1056,7 @@ elif st.session_state.page == "main":
             except Exception as e:
                 st.error(t(f"メモ履歴の表示中にエラーが発生しました: {str(e)}", 
                           f"An error occurred while displaying memo history: {str(e)}"))
+                import traceback
                 logging.error(f"メモ履歴表示エラー: {str(e)}\n{traceback.format_exc()}")
 
 # フッター